@@ -1,14 +1,42 @@
+import glob
+import os
+import tempfile
+import time
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
+import pyarrow as pa
+import pyarrow.compute as pc
+import plotly.graph_objects as go
 import requests
-import json # You might need this if FRED returns JSON, though requests usually handles it.
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 
 # --- Configuration ---
 # FRED API Key (retrieved securely via Streamlit secrets)
 FRED_API_KEY = st.secrets["FRED_API_KEY"]
 FRED_BASE_URL = "https://api.stlouisfed.org/fred/series/observations"
 
+# Shared HTTP session so repeat fetches reuse the pooled keep-alive TLS connection to FRED.
+# Held in st.cache_resource so the same pool survives script reruns and hot-reloads.
+@st.cache_resource
+def get_session():
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False # Hand the final response back so its status can be checked
+        )
+    ))
+    session.headers.update({"Accept-Encoding": "gzip"})
+    return session
+
 # Define the economic indicators you want to display
 # Key is the user-friendly name, value is a dictionary with FRED Series ID and description
 ECONOMIC_INDICATORS = {
@@ -34,116 +62,198 @@ ECONOMIC_INDICATORS = {
     }
 }
 
+# On-disk cache so fetched series survive app restarts and redeploys
+CACHE_DIR = os.path.join(".", ".cache")
+DEFAULT_CACHE_TTL = 86400 # 1 day
+# Per-series TTL in seconds, matched to FRED's release cadence
+SERIES_CACHE_TTL = {
+    "DFF": 86400,          # Daily
+    "DGS10": 86400,        # Daily
+    "UNRATE": 86400,       # Monthly
+    "CPIAUCSL": 86400,     # Monthly
+    "GDPC1": 7 * 86400     # Quarterly
+}
+
+# Only the fields we use from each FRED observation record (all arrive as strings);
+# the per-row realtime_start/realtime_end fields are skipped instead of materialized
+FRED_OBSERVATION_SCHEMA = pa.schema([
+    ("date", pa.string()),
+    ("value", pa.string())
+])
+
 # --- Data Fetching Function ---
-@st.cache_data(ttl=3600) # Cache data for 1 hour
+def _cache_path(series_id, start_date, end_date):
+    # Ranges running up to today are keyed as "latest" so the per-series TTL, not the
+    # calendar date, decides when they go stale
+    if end_date is None or end_date >= time.strftime("%Y-%m-%d"):
+        end_date = "latest"
+    return os.path.join(CACHE_DIR, f"{series_id}_{start_date}_{end_date}.parquet")
+
+
+def _read_disk_cache(series_id, start_date, end_date):
+    path = _cache_path(series_id, start_date, end_date)
+    ttl = SERIES_CACHE_TTL.get(series_id, DEFAULT_CACHE_TTL)
+    try:
+        if time.time() - os.path.getmtime(path) < ttl:
+            return pd.read_parquet(path)['value']
+        os.remove(path) # Expired entry, drop it before refetching
+    except (OSError, ValueError):
+        pass # Missing or unreadable cache file, fall back to the API
+    return None
+
+
+def _sweep_disk_cache(series_id):
+    # Every date range gets its own file, so clear out this series' expired ranges
+    ttl = SERIES_CACHE_TTL.get(series_id, DEFAULT_CACHE_TTL)
+    now = time.time()
+    for path in glob.glob(os.path.join(CACHE_DIR, f"{series_id}_*.parquet")):
+        try:
+            if now - os.path.getmtime(path) >= ttl:
+                os.remove(path)
+        except OSError:
+            pass # Already removed by another worker
+
+
+def _write_disk_cache(series_id, start_date, end_date, series):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _sweep_disk_cache(series_id)
+        # Write to a temp file and swap it in so other sessions never read a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        os.close(fd)
+        try:
+            series.to_frame(name='value').to_parquet(tmp_path, compression="zstd")
+            os.replace(tmp_path, _cache_path(series_id, start_date, end_date))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    except OSError:
+        pass # Caching is best-effort; a read-only filesystem shouldn't break the app
+
+
+@st.cache_data(ttl=3600, show_spinner=False) # Cache data for 1 hour; the Parquet layer persists across restarts
 def fetch_fred_data(series_id, api_key, start_date=None, end_date=None):
+    cached = _read_disk_cache(series_id, start_date, end_date)
+    if cached is not None:
+        return cached
+
+    data_series = _download_fred_data(series_id, api_key, start_date, end_date)
+    if not data_series.empty:
+        _write_disk_cache(series_id, start_date, end_date, data_series)
+    return data_series
+
+
+def _download_fred_data(series_id, api_key, start_date=None, end_date=None):
     params = {
         "series_id": series_id,
         "api_key": api_key,
-        "file_type": "json",
-        "observation_start": start_date,
-        "observation_end": end_date
+        "file_type": "json"
     }
-    try:
-        response = requests.get(FRED_BASE_URL, params=params)
-        response.raise_for_status() # Raise an HTTPError for bad responses (4xx or 5xx)
-        data = response.json()
-
-        observations = data.get("observations", [])
-        df = pd.DataFrame(observations)
-
-        if not df.empty:
-            df['date'] = pd.to_datetime(df['date'])
-            # Convert '.' (missing values in FRED) to NaN
-            df['value'] = pd.to_numeric(df['value'], errors='coerce')
-            df.set_index('date', inplace=True)
-            df.sort_index(inplace=True) # Ensure chronological order
-            return df['value']
-        else:
-            return pd.Series(dtype='float64') # Return empty series if no data
+    # Let FRED filter the date range server-side instead of downloading the full history
+    if start_date:
+        params["observation_start"] = start_date
+    if end_date:
+        params["observation_end"] = end_date
+    # Errors are raised rather than returned as an empty series so that st.cache_data never
+    # caches a failed fetch; render_chart reports them to the user
+    response = get_session().get(FRED_BASE_URL, params=params, timeout=15)
+    if response.status_code != 200:
+        raise requests.exceptions.HTTPError(
+            f"HTTP {response.status_code} {response.reason}", response=response
+        )
 
-    except requests.exceptions.RequestException as e:
-        st.error(f"Error fetching data for {series_id}: {e}")
-        return pd.Series(dtype='float64')
-    except json.JSONDecodeError as e:
-        st.error(f"Error decoding JSON for {series_id}: {e}")
-        return pd.Series(dtype='float64')
-    except Exception as e:
-        st.error(f"An unexpected error occurred for {series_id}: {e}")
-        return pd.Series(dtype='float64')
+    data = orjson.loads(response.content)
 
+    observations = data.get("observations", [])
+    if not observations:
+        return pd.Series(dtype='float64') # Return empty series if no data
 
-# --- Main Streamlit Application ---
-def main():
-    st.set_page_config(
-        page_title="Public Data Visualizer",
-        page_icon="📊",
-        layout="wide"
+    # Build the table in Arrow and parse/clean columns with its vectorized kernels
+    table = pa.Table.from_pylist(observations, schema=FRED_OBSERVATION_SCHEMA)
+    dates = pc.strptime(table["date"], format="%Y-%m-%d", unit="ns")
+    # Convert '.' (missing values in FRED) to null before casting to float
+    raw_values = table["value"]
+    values = pc.cast(
+        pc.if_else(pc.equal(raw_values, "."), pa.scalar(None, pa.string()), raw_values),
+        pa.float64()
+    )
+    # Keep values Arrow-backed so Streamlit's Arrow encoder can reuse the buffers
+    data_series = pd.Series(
+        pd.arrays.ArrowExtensionArray(values),
+        index=pd.DatetimeIndex(dates.to_numpy(zero_copy_only=False), name='date'),
+        name='value'
     )
+    # FRED returns observations chronologically, so only sort if that ever changes
+    if not data_series.index.is_monotonic_increasing:
+        data_series.sort_index(inplace=True)
+    return data_series
 
-    st.title("📊 Public Data Visualizer Dashboard")
 
-    st.markdown("""
-    Explore key economic indicators with interactive charts.
-    """)
+def prefetch_all_indicators(start_date, end_date):
+    # Warm the cache for every indicator in parallel so switching series in the sidebar is instant
+    series_ids = [info["id"] for info in ECONOMIC_INDICATORS.values()]
+    with ThreadPoolExecutor(max_workers=len(series_ids)) as executor:
+        futures = [
+            executor.submit(fetch_fred_data, sid, FRED_API_KEY, start_date, end_date)
+            for sid in series_ids
+        ]
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception:
+                pass # Only a warm-up; failures aren't cached, so the chart refetches and reports them
 
-    # --- ADD THIS NEW DISCLAIMER HERE ---
-    st.info("""
-    **Important Note:** This dashboard visualizes macroeconomic data fetched directly from the **FRED (Federal Reserve Economic Data) API**.
-    Please be aware that economic data often has reporting lags (e.g., monthly, quarterly updates).
-    The charts reflect the most current data available via the FRED API.
-    Future updates may include additional indicators and data sources.
-    """)
-    # --- END OF DISCLAIMER ---
 
+# --- Chart Rendering ---
+# float32 keeps 3-decimal hover values exact only for magnitudes well below this;
+# larger series (e.g. GDPC1 in the 20,000s) stay float64
+FLOAT32_MAX_MAGNITUDE = 1000
 
-    st.sidebar.header("Select Indicator & Date Range")
 
-    selected_indicator_name = st.sidebar.selectbox(
-        "Choose an Economic Indicator",
-        list(ECONOMIC_INDICATORS.keys())
-    )
+def chart_values(data_series):
+    # Send float32 to the browser when the series' scale allows it, halving the y payload
+    values = data_series.to_numpy(dtype="float64", na_value=float("nan"))
+    if np.nanmax(np.abs(values), initial=0) < FLOAT32_MAX_MAGNITUDE:
+        return values.astype(np.float32)
+    return values
+
 
+def render_chart(selected_indicator_name, start_date, end_date):
     selected_indicator_info = ECONOMIC_INDICATORS[selected_indicator_name]
     series_id = selected_indicator_info["id"]
     description = selected_indicator_info["description"]
 
-    # Date Range selection
-    today = pd.to_datetime("today").date()
-    default_start_date = today - pd.DateOffset(years=10) # Default to last 10 years
-
-    col1, col2 = st.sidebar.columns(2)
-    with col1:
-        start_date = st.date_input("Start Date", value=default_start_date)
-    with col2:
-        end_date = st.date_input("End Date", value=today)
-
-    if start_date >= end_date:
-        st.sidebar.error("Error: End Date must be after Start Date.")
-        return
-
     st.subheader(f"{selected_indicator_name} Trends")
     st.markdown(f"*{description}*")
 
 
-    with st.spinner(f"Fetching data for {selected_indicator_name}..."):
-        data_series = fetch_fred_data(series_id, FRED_API_KEY, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
+    try:
+        with st.spinner(f"Fetching data for {selected_indicator_name}..."):
+            data_series = fetch_fred_data(series_id, FRED_API_KEY, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error fetching data for {series_id}: {e}")
+        return
+    except orjson.JSONDecodeError as e:
+        st.error(f"Error decoding JSON for {series_id}: {e}")
+        return
 
     if not data_series.empty:
-        # Create a DataFrame for Plotly, ensuring 'date' is a column
-        plot_df = data_series.reset_index()
-        plot_df.columns = ['Date', 'Value'] # Rename columns for clarity
-
-        fig = px.line(
-            plot_df,
-            x='Date',
-            y='Value',
+        # Hand Plotly the raw arrays directly; SVG Scatter (not WebGL) so the range slider shows a preview
+        fig = go.Figure(go.Scatter(
+            x=data_series.index.to_numpy(),
+            y=chart_values(data_series),
+            mode="lines",
+            name=selected_indicator_name,
+            hovertemplate="%{y:.3f}"
+        ))
+
+        fig.update_layout(
             title=f'{selected_indicator_name} Historical Data',
-            labels={'Value': selected_indicator_name, 'Date': 'Date'},
-            template='plotly_white'
+            xaxis_title='Date',
+            yaxis_title=selected_indicator_name,
+            template='plotly_white',
+            hovermode="x unified" # Shows all traces on hover
         )
-
-        fig.update_layout(hovermode="x unified") # Shows all traces on hover
         fig.update_xaxes(
             rangeslider_visible=True,
             rangeselector=dict(
@@ -159,7 +269,7 @@ def main():
         st.plotly_chart(fig, use_container_width=True)
 
         st.subheader("Raw Data (First 10 Rows)")
-        st.dataframe(plot_df.head(10))
+        st.dataframe(data_series.head(10).rename_axis('Date').to_frame(name=selected_indicator_name), use_container_width=True)
 
         st.markdown(
             f"Data Source: [FRED API - {selected_indicator_name}]({FRED_BASE_URL.replace('/series/observations', '')}/series/{series_id})"
@@ -169,5 +279,66 @@ def main():
         st.warning(f"No data available for '{selected_indicator_name}' in the selected date range, or an error occurred.")
 
 
+# --- Static Page Content ---
+PAGE_INTRO = """
+Explore key economic indicators with interactive charts.
+"""
+
+PAGE_DISCLAIMER = """
+**Important Note:** This dashboard visualizes macroeconomic data fetched directly from the **FRED (Federal Reserve Economic Data) API**.
+Please be aware that economic data often has reporting lags (e.g., monthly, quarterly updates).
+The charts reflect the most current data available via the FRED API.
+Future updates may include additional indicators and data sources.
+"""
+
+
+def render_header():
+    # Static page header; Streamlit re-emits these elements on every rerun
+    st.title("📊 Public Data Visualizer Dashboard")
+    st.markdown(PAGE_INTRO)
+    st.info(PAGE_DISCLAIMER)
+
+
+# --- Main Streamlit Application ---
+def main():
+    st.set_page_config(
+        page_title="Public Data Visualizer",
+        page_icon="📊",
+        layout="wide"
+    )
+
+    render_header()
+
+    st.sidebar.header("Select Indicator & Date Range")
+
+    selected_indicator_name = st.sidebar.selectbox(
+        "Choose an Economic Indicator",
+        list(ECONOMIC_INDICATORS.keys())
+    )
+
+    # Date Range selection
+    today = pd.to_datetime("today").date()
+    default_start_date = today - pd.DateOffset(years=10) # Default to last 10 years
+
+    # Prefetch the default date range once per session
+    if "prefetched" not in st.session_state:
+        # Mark it done up front so a failed warm-up isn't retried on every rerun
+        st.session_state["prefetched"] = True
+        with st.spinner("Loading economic indicators..."):
+            prefetch_all_indicators(default_start_date.strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d"))
+
+    col1, col2 = st.sidebar.columns(2)
+    with col1:
+        start_date = st.date_input("Start Date", value=default_start_date)
+    with col2:
+        end_date = st.date_input("End Date", value=today)
+
+    if start_date >= end_date:
+        st.sidebar.error("Error: End Date must be after Start Date.")
+        return
+
+    render_chart(selected_indicator_name, start_date, end_date)
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file